@@ -5,12 +5,20 @@ No external programs or wrappers - implements the complete 1-Wire protocol in pu
 """
 
 import argparse
+import re
 import serial
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Tuple, Optional
 
+# Optional C-accelerated CRC; fall back to the lookup table below without it
+try:
+    from crcmod import mkCrcFun
+except ImportError:
+    mkCrcFun = None
+
 # CRC-8 lookup table for Dallas/Maxim polynomial (0x31)
 CRC8_TABLE = [
     0, 94, 188, 226, 97, 63, 221, 131, 194, 156, 126, 32, 163, 253, 31, 65,
@@ -32,48 +40,92 @@ CRC8_TABLE = [
 ]
 
 
-def crc8(data: List[int]) -> int:
+# Dallas/Maxim CRC-8 is the reflected form of polynomial 0x131
+_crc8 = mkCrcFun(0x131, initCrc=0, rev=True) if mkCrcFun else None
+
+
+def crc8(data: bytes) -> int:
     """Calculate CRC-8 for Dallas/Maxim devices."""
+    if _crc8 is not None:
+        return _crc8(bytes(data))
     crc = 0
     for byte in data:
         crc = CRC8_TABLE[crc ^ byte]
     return crc
 
 
+def _decode_bits(rx: bytes) -> int:
+    """Decode up to 8 bit slot responses into a byte (LSB first)."""
+    # SWAR: flag every lane that read back exactly 0xFF (its inverse is a
+    # zero byte), then one multiply gathers lane i into bit i of the top
+    # byte. Missing lanes from a short read decode as 0.
+    inv = int.from_bytes(rx, 'little') ^ 0xFFFFFFFFFFFFFFFF
+    low7 = 0x7F7F7F7F7F7F7F7F
+    lanes = ~(((inv & low7) + low7) | inv | low7) & 0x8080808080808080
+    return ((lanes >> 7) * 0x0102040810204080) >> 56 & 0xFF
+
+
+# Bit slot expansion table: byte value -> its 8 slot bytes (LSB first)
+BIT_EXPAND = [
+    bytes(0xFF if (byte >> i) & 1 else 0x00 for i in range(8))
+    for byte in range(256)
+]
+
+
+def _bits_for_bytes(vals: bytes) -> bytes:
+    """Expand bytes into 1-Wire bit slots (LSB first, 0xFF = 1, 0x00 = 0)."""
+    return b''.join([BIT_EXPAND[byte] for byte in vals])
+
+
+def _bytes_from_bits(rx: bytes, out: bytearray):
+    """Collapse 1-Wire bit slot responses back into bytes (LSB first) in place."""
+    slots = memoryview(rx)
+    for i in range(len(out)):
+        out[i] = _decode_bits(slots[i * 8:i * 8 + 8])
+
+
 class OneWireAdapter:
     """DS9097 passive serial adapter for 1-Wire protocol."""
     
     def __init__(self, device_path: str):
         self.device_path = device_path
         self.port: Optional[serial.Serial] = None
+        self._cached_devices: Optional[List[bytes]] = None
+        self._scratchpad = bytearray(9)
         
     def __enter__(self):
-        return self
-        
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.port:
-            self.port.close()
-    
-    def reset(self) -> bool:
-        """Send reset pulse and check for presence."""
-        # Close existing port if open
-        if self.port:
-            self.port.close()
-            
-        # Open at 9600 baud for reset
+        # Open the port once for the whole session; resets and data
+        # transfers only change the baud rate
         try:
             self.port = serial.Serial(
                 self.device_path,
-                baudrate=9600,
+                baudrate=115200,
                 bytesize=serial.EIGHTBITS,
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
-                timeout=1
+                timeout=1,
+                rtscts=False,
+                dsrdtr=False,
+                exclusive=True
             )
         except serial.SerialException as e:
             print(f"Error opening {self.device_path}: {e}", file=sys.stderr)
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.port:
+            self.port.close()
+    
+    def reset(self) -> bool:
+        """Send reset pulse and check for presence."""
+        # Port failed to open in __enter__
+        if self.port is None:
             return False
         
+        # Switch to 9600 baud for reset and drop any stale input
+        self.port.baudrate = 9600
+        self.port.reset_input_buffer()
+        
         # Send reset pulse (0xF0)
         self.port.write(bytes([0xF0]))
         self.port.flush()
@@ -89,17 +141,7 @@ class OneWireAdapter:
     
     def switch_to_data_mode(self):
         """Switch to 115200 baud for data transfer."""
-        if self.port:
-            self.port.close()
-            
-        self.port = serial.Serial(
-            self.device_path,
-            baudrate=115200,
-            bytesize=serial.EIGHTBITS,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            timeout=1
-        )
+        self.port.baudrate = 115200
     
     def touch_bit(self, bit: int) -> int:
         """Transfer a single bit on the 1-Wire bus."""
@@ -115,14 +157,17 @@ class OneWireAdapter:
         # If we read back 0xFF, the bit is 1; otherwise 0
         return 1 if rx_byte[0] == 0xFF else 0
     
+    def touch_bits(self, slots: bytes) -> bytes:
+        """Transfer a burst of bit slots in a single serial write/read."""
+        # No flush(): read() already blocks until every slot has echoed back
+        self.port.write(slots)
+        return self.port.read(len(slots))
+
     def touch_byte(self, byte_val: int) -> int:
         """Transfer a byte on the 1-Wire bus (LSB first)."""
-        result = 0
-        for i in range(8):
-            bit = (byte_val >> i) & 1
-            read_bit = self.touch_bit(bit)
-            result |= (read_bit << i)
-        return result
+        # Send all 8 bit slots in one write and read back all 8 responses
+        rx = self.touch_bits(_bits_for_bytes(bytes([byte_val])))
+        return _decode_bits(rx)
     
     def write_byte(self, byte_val: int):
         """Write a byte to the 1-Wire bus."""
@@ -132,8 +177,15 @@ class OneWireAdapter:
         """Read a byte from the 1-Wire bus."""
         return self.touch_byte(0xFF)
     
-    def search_rom(self) -> List[List[int]]:
-        """Search for all devices on the bus using Search ROM algorithm."""
+    def search_rom(self, force: bool = False) -> List[bytes]:
+        """Search for all devices on the bus using Search ROM algorithm.
+
+        The result is cached for the adapter's lifetime; pass force=True to
+        rescan the bus.
+        """
+        if self._cached_devices is not None and not force:
+            return list(self._cached_devices)
+        
         devices = []
         last_discrepancy = 0
         last_device = False
@@ -147,13 +199,14 @@ class OneWireAdapter:
             # Send SEARCH_ROM command (0xF0)
             self.write_byte(0xF0)
             
-            rom = [0] * 8
+            rom = bytearray(8)
             discrepancy = 0
             
             for bit_pos in range(64):
-                # Read bit and its complement
-                bit = self.touch_bit(1)
-                comp_bit = self.touch_bit(1)
+                # Read bit and its complement as one 2-slot burst
+                rx = self.touch_bits(b'\xFF\xFF')
+                bit = 1 if rx[0:1] == b'\xFF' else 0
+                comp_bit = 1 if rx[1:2] == b'\xFF' else 0
                 
                 if bit == 1 and comp_bit == 1:
                     # No devices responded
@@ -195,78 +248,101 @@ class OneWireAdapter:
                     
                 # Validate CRC
                 if crc8(rom) == 0:
-                    devices.append(rom)
+                    devices.append(bytes(rom))
                 else:
                     # Invalid CRC, skip this device
                     pass
         
+        # Only cache a successful scan so an empty bus is rescanned next time
+        if devices:
+            self._cached_devices = list(devices)
         return devices
     
-    def read_temperature(self, rom: List[int]) -> Optional[float]:
-        """Read temperature from a specific DS18B20 sensor."""
+    def start_conversion(self, rom: Optional[bytes] = None) -> bool:
+        """Start a temperature conversion without waiting for it to finish.
+
+        With no ROM, CONVERT_T is broadcast to every sensor via SKIP_ROM.
+        """
         # Reset and check presence
         if not self.reset():
             print("Reset failed - no presence pulse", file=sys.stderr)
-            return None
+            return False
             
         self.switch_to_data_mode()
         
-        # Send MATCH_ROM command (0x55)
-        self.write_byte(0x55)
-        
-        # Send ROM address (8 bytes)
-        for byte in rom:
-            self.write_byte(byte)
-        
-        # Send CONVERT_T command (0x44)
-        self.write_byte(0x44)
-        
-        # Wait for conversion (750ms for 12-bit resolution)
-        time.sleep(0.75)
-        
-        # Reset again
+        if rom is None:
+            # SKIP_ROM (0xCC) + CONVERT_T (0x44) addresses all sensors at once
+            self.touch_bits(_bits_for_bytes(bytes([0xCC, 0x44])))
+        else:
+            # MATCH_ROM (0x55) + ROM address + CONVERT_T (0x44) as one burst
+            self.touch_bits(_bits_for_bytes(bytes([0x55]) + rom + bytes([0x44])))
+        return True
+    
+    def read_scratchpad(self, rom: bytes) -> Optional[float]:
+        """Read back the converted temperature from a specific DS18B20 sensor."""
         if not self.reset():
-            print("Second reset failed", file=sys.stderr)
+            print("Reset failed - no presence pulse", file=sys.stderr)
             return None
             
         self.switch_to_data_mode()
         
-        # Send MATCH_ROM command again
-        self.write_byte(0x55)
-        
-        # Send ROM address
-        for byte in rom:
-            self.write_byte(byte)
+        # Always MATCH_ROM (0x55) + ROM address: with SKIP_ROM, replies from
+        # several devices are wired-ANDed and can still pass the CRC
+        address = bytes([0x55]) + rom
         
-        # Send READ_SCRATCHPAD command (0xBE)
-        self.write_byte(0xBE)
+        # Address + READ_SCRATCHPAD (0xBE) followed by 9 read slots for the
+        # scratchpad, all as one burst
+        tx = _bits_for_bytes(address + bytes([0xBE]) + b'\xFF' * 9)
+        rx = self.touch_bits(tx)
+        if len(rx) != len(tx):
+            print(f"Short read from sensor {rom_to_hex(rom)}", file=sys.stderr)
+            return None
         
-        # Read 9 bytes of scratchpad
-        scratchpad = []
-        for _ in range(9):
-            scratchpad.append(self.read_byte())
+        # Only the last 72 slots carry the scratchpad
+        scratchpad = self._scratchpad
+        _bytes_from_bits(memoryview(rx)[-72:], scratchpad)
         
         # Validate CRC
         if crc8(scratchpad) != 0:
             print(f"CRC validation failed for sensor {rom_to_hex(rom)}", file=sys.stderr)
             return None
         
-        # Extract temperature (bytes 0 and 1, little-endian)
-        temp_raw = (scratchpad[1] << 8) | scratchpad[0]
-        
-        # Handle signed 16-bit value
-        if temp_raw & 0x8000:
-            temp_raw = -((temp_raw ^ 0xFFFF) + 1)
+        # Extract temperature (bytes 0 and 1, signed 16-bit little-endian)
+        temp_raw = int.from_bytes(scratchpad[0:2], 'little', signed=True)
         
         # Convert to Celsius (resolution: 0.0625°C per bit)
         temp_c = temp_raw * 0.0625
         
         return temp_c
+    
+    def read_temperature(self, rom: bytes) -> Optional[float]:
+        """Read temperature from a specific DS18B20 sensor."""
+        if not self.start_conversion(rom):
+            return None
+        
+        # Wait for conversion (750ms for 12-bit resolution)
+        time.sleep(0.75)
+        
+        return self.read_scratchpad(rom)
+    
+    def read_temperature_single(self, rom: bytes) -> Optional[float]:
+        """Read temperature from the only configured DS18B20 sensor on the bus.
+
+        CONVERT_T is broadcast with SKIP_ROM, saving 8 ROM bytes; the
+        scratchpad is still read with MATCH_ROM.
+        """
+        if not self.start_conversion():
+            return None
+        
+        # Wait for conversion (750ms for 12-bit resolution)
+        time.sleep(0.75)
+        
+        return self.read_scratchpad(rom)
 
 
-def rom_to_hex(rom: List[int]) -> str:
+def rom_to_hex(rom: bytes) -> str:
     """Convert ROM address to hex string."""
-    return ''.join(f'{byte:02x}' for byte in rom)
+    return bytes(rom).hex()
 
 
 def format_timestamp() -> str:
@@ -280,10 +356,21 @@ def celsius_to_fahrenheit(c: float) -> float:
     return c * 9.0 / 5.0 + 32.0
 
 
-def read_config(config_path: str) -> Tuple[str, List[List[int]]]:
-    """Read configuration file."""
-    device_path = "/dev/ttyUSB0"
-    sensors = []
+# ROM <index> <8 hex bytes>, each byte with or without 0x prefix
+ROM_LINE_RE = re.compile(r'^ROM\s+\d+((?:\s+(?:0[xX])?[0-9A-Fa-f]{1,2}){8})(?:\s|$)')
+
+
+def read_buses(config_path: str) -> List[Tuple[str, List[bytes]]]:
+    """Read configuration file grouped by adapter.
+
+    Each ROM line belongs to the TTY line before it, so a config can list
+    several adapters. Sections repeating a TTY are merged so each device is
+    opened once. ROM lines before the first TTY go to the first adapter.
+    """
+    buses = []
+    bus_index = {}
+    current = None
+    unassigned = []
     
     try:
         with open(config_path, 'r') as f:
@@ -297,22 +384,28 @@ def read_config(config_path: str) -> Tuple[str, List[List[int]]]:
                     continue
                 
                 if parts[0] == "TTY":
-                    device_path = parts[1]
-                elif parts[0] == "ROM" and len(parts) >= 10:
-                    # Parse ROM: ROM <index> <8 hex bytes>
-                    rom = []
-                    for i in range(2, 10):
-                        # Handle hex values with or without 0x prefix
-                        hex_str = parts[i].replace('0x', '')
-                        rom.append(int(hex_str, 16))
-                    sensors.append(rom)
+                    if parts[1] not in bus_index:
+                        bus_index[parts[1]] = len(buses)
+                        buses.append((parts[1], []))
+                    current = buses[bus_index[parts[1]]][1]
+                elif parts[0] == "ROM":
+                    match = ROM_LINE_RE.match(line)
+                    if not match:
+                        print(f"Ignoring malformed config line: {line}", file=sys.stderr)
+                        continue
+                    rom = bytes(int(hex_str, 16) for hex_str in match.group(1).split())
+                    (unassigned if current is None else current).append(rom)
     except FileNotFoundError:
         pass
     
-    return device_path, sensors
+    if not buses:
+        buses.append(("/dev/ttyUSB0", []))
+    buses[0][1][:0] = unassigned
+    
+    return buses
 
 
-def write_config(config_path: str, device_path: str, sensors: List[List[int]]):
+def write_config(config_path: str, device_path: str, sensors: List[bytes]):
     """Write configuration file."""
     with open(config_path, 'w') as f:
         f.write(f"TTY {device_path}\n")
@@ -323,6 +416,18 @@ def write_config(config_path: str, device_path: str, sensors: List[List[int]]):
             f.write(f"ROM {idx} {rom_hex}\n")
 
 
+def read_bus(device_path: str, sensors: List[bytes]) -> List[Optional[float]]:
+    """Read every sensor on one adapter, sharing a single conversion wait."""
+    with OneWireAdapter(device_path) as adapter:
+        # Start every conversion at once, wait a single conversion time,
+        # then collect each scratchpad
+        if not adapter.start_conversion():
+            return [None] * len(sensors)
+        time.sleep(0.75)
+        
+        return [adapter.read_scratchpad(rom) for rom in sensors]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Native Python3 DS18B20 temperature reader via DS9097"
@@ -339,12 +444,13 @@ def main():
     args = parser.parse_args()
     
     config_path = "digitemp.conf"
+    buses = read_buses(config_path)
     
     # Determine device path
-    if args.device:
-        device_path = args.device
-    else:
-        device_path, _ = read_config(config_path)
+    device_path = args.device or buses[-1][0]
+    if (args.init or args.walk) and not args.device and len(buses) > 1:
+        print(f"Config lists {len(buses)} adapters; using {device_path} "
+              f"(choose another with -s)")
     
     # Initialize mode (-i flag)
     if args.init:
@@ -382,39 +488,56 @@ def main():
         
         return 0
     
-    # Read temperature mode
-    device_path, sensors = read_config(config_path)
+    # Read temperature mode; -s reads every configured sensor on that device
+    if args.device:
+        buses = [(args.device, [rom for _, roms in buses for rom in roms])]
+    sensors = [(bus_device, rom) for bus_device, roms in buses for rom in roms]
     
     if not sensors:
         print("No sensors found in config. Run with -i to initialize.", file=sys.stderr)
         return 1
     
-    with OneWireAdapter(device_path) as adapter:
-        if args.sensor_index is not None:
-            # Read specific sensor
-            if args.sensor_index < 0 or args.sensor_index >= len(sensors):
-                print(f"Invalid sensor index: {args.sensor_index}", file=sys.stderr)
-                return 1
-            
-            rom = sensors[args.sensor_index]
-            temp_c = adapter.read_temperature(rom)
-            
-            if temp_c is None:
-                return 1
-            
-            # Print only temperature value (no timestamp)
-            print(f"{temp_c:.2f}")
-        else:
-            # Read all sensors
-            for idx, rom in enumerate(sensors):
+    if args.sensor_index is not None:
+        # Read specific sensor
+        if args.sensor_index < 0 or args.sensor_index >= len(sensors):
+            print(f"Invalid sensor index: {args.sensor_index}", file=sys.stderr)
+            return 1
+        
+        bus_device, rom = sensors[args.sensor_index]
+        bus_size = sum(1 for device, _ in sensors if device == bus_device)
+        with OneWireAdapter(bus_device) as adapter:
+            if bus_size == 1:
+                temp_c = adapter.read_temperature_single(rom)
+            else:
                 temp_c = adapter.read_temperature(rom)
-                
-                if temp_c is None:
-                    continue
-                
-                timestamp = format_timestamp()
-                temp_f = celsius_to_fahrenheit(temp_c)
-                print(f"{timestamp} Sensor {idx} C: {temp_c:.2f} F: {temp_f:.2f}")
+        
+        if temp_c is None:
+            return 1
+        
+        # Print only temperature value (no timestamp)
+        print(f"{temp_c:.2f}")
+        return 0
+    
+    # Read all sensors; with several adapters each runs in its own thread so
+    # their conversion waits overlap. Adapters without sensors are skipped.
+    buses = [(bus_device, roms) for bus_device, roms in buses if roms]
+    if len(buses) == 1:
+        results = [read_bus(*buses[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(buses)) as pool:
+            results = list(pool.map(lambda bus: read_bus(*bus), buses))
+    temps = [temp_c for bus_temps in results for temp_c in bus_temps]
+    
+    # Convert every reading to Fahrenheit in one pass
+    temps_f = [None if temp_c is None else celsius_to_fahrenheit(temp_c)
+               for temp_c in temps]
+    
+    for idx, (temp_c, temp_f) in enumerate(zip(temps, temps_f)):
+        if temp_c is None:
+            continue
+        
+        timestamp = format_timestamp()
+        print(f"{timestamp} Sensor {idx} C: {temp_c:.2f} F: {temp_f:.2f}")
     
     return 0
 